@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""Shared BC Parks availability client.
+
+The polling and notification machinery that used to be copy-pasted between
+double_site.py, test.py and v1.py lives here, so optimizations (connection
+pooling, retries, response caching, email reuse) only have to be applied in
+one place instead of three.
+"""
+import atexit
+import functools
+import logging
+import os
+import queue
+import re
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from types import MappingProxyType
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger("bcparks")
+
+BASE_URL = "https://camping.bcparks.ca/api/availability/cards"
+DEFAULT_SENDER = "kjoshy12@gmail.com"
+MAX_WORKERS = 6
+REQUESTS_PER_SECOND = 4
+
+# Static query parameters, frozen once at import; check() only patches the
+# per-call fields instead of rebuilding the whole dict.
+_PARAMS_TEMPLATE = MappingProxyType({
+    "resourceId": "",
+    "bookingCategoryId": 0,
+    "resourceLocationId": 0,
+    "equipmentCategoryId": -32768,
+    "subEquipmentCategoryId": -32768,
+    "numEquipment": "",
+    "startDate": "",
+    "endDate": "",
+    "nights": 1,
+    "filterData": "[]",
+    "boatLength": 0,
+    "boatDraft": 0,
+    "boatWidth": 0,
+    "peopleCapacityCategoryCounts": "[]",
+    "preferWeekends": "true",
+    "seed": "",
+})
+
+_HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Referer': 'https://camping.bcparks.ca/',
+    'Origin': 'https://camping.bcparks.ca',
+    'Cache-Control': 'no-cache',
+    'Content-Type': 'application/json',
+})
+
+# Retries back off exponentially (and honor Retry-After) only when the
+# server actually pushes back, instead of sleeping between every call.
+_RETRY = Retry(
+    total=5,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET", "POST"]),
+    respect_retry_after_header=True,
+)
+
+
+# === Rate Limiter ===
+class RateLimiter:
+    """Token bucket so concurrent workers stay under a requests-per-second
+    cap without serializing the whole loop behind a fixed sleep."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# One bucket per host, shared by every client in the process, so the
+# politeness cap holds globally even if several CampingClients are built.
+_HOST_LIMITERS = {}
+_HOST_LIMITERS_LOCK = threading.Lock()
+
+def get_rate_limiter(host="camping.bcparks.ca", rate=REQUESTS_PER_SECOND):
+    with _HOST_LIMITERS_LOCK:
+        limiter = _HOST_LIMITERS.get(host)
+        if limiter is None:
+            limiter = _HOST_LIMITERS[host] = RateLimiter(rate)
+        return limiter
+
+
+# The server only uses `seed` as a cache-buster, so keep the ISO-8601 shape
+# it normally sees but only re-run strftime when the wall-clock second
+# changes; the milliseconds are patched in with an f-string.
+_SEED_STATE = [0, ""]
+
+def _make_seed():
+    sec, ms = divmod(time.time_ns() // 1_000_000, 1000)
+    if sec != _SEED_STATE[0]:
+        _SEED_STATE[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+        _SEED_STATE[0] = sec
+    return f"{_SEED_STATE[1]}.{ms:03d}Z"
+
+
+# === Parse JSON ===
+def parse_camping_response(json_response, location_name):
+    available_resources = []
+    for card in json_response.get("availabilityCards", []):
+        resource_id = card.get("resourceId")
+        date_ranges = card.get("dateRanges", [])
+        if date_ranges:
+            available_resources.append({
+                "locationName": location_name,
+                "resourceId": resource_id,
+                "dateRanges": date_ranges
+            })
+    return available_resources
+
+# Successive polls usually return a byte-identical payload (no change in
+# availability), so cache the parsed result keyed on the raw body bytes and
+# skip the JSON walk on repeats.
+@functools.lru_cache(maxsize=64)
+def _parse_cached(content, location_name):
+    return parse_camping_response(orjson.loads(content), location_name)
+
+
+def build_tasks(resource_locations, date_ranges, today=None):
+    """Expand (start, end) string ranges x locations into check_many tasks,
+    clamping starts to today and skipping ranges already in the past."""
+    if today is None:
+        today = date.today()
+
+    tasks = []
+    for original_start, original_end in date_ranges:
+        # fromisoformat is ~5x faster than strptime and the ranges are
+        # already ISO dates.
+        start_dt = date.fromisoformat(original_start)
+        end_dt = date.fromisoformat(original_end)
+
+        if end_dt < today:
+            logger.info("⏩ Skipping range %s to %s (already in the past)", original_start, original_end)
+            continue
+
+        effective_start = max(start_dt, today)
+        effective_start_str = effective_start.isoformat()
+        end_str = end_dt.isoformat()
+
+        logger.info("📅 Checking range %s to %s", effective_start_str, end_str)
+
+        for location_name, location_id in resource_locations.items():
+            tasks.append((location_id, location_name, effective_start_str, end_str))
+
+    return tasks
+
+
+# === Availability Client ===
+class CampingClient:
+    """Availability checker holding one pooled HTTPS session for the whole
+    run so the TLS handshake to camping.bcparks.ca is only paid once."""
+
+    def __init__(self, filter_data="[]", prefer_weekends="true",
+                 requests_per_second=REQUESTS_PER_SECOND, max_workers=MAX_WORKERS):
+        self.filter_data = filter_data
+        self.prefer_weekends = prefer_weekends
+        self.max_workers = max_workers
+        self.rate_limiter = get_rate_limiter(rate=requests_per_second)
+
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=_RETRY))
+        self.session.headers.update(_HEADERS)
+        atexit.register(self.session.close)
+
+    def check(self, location_id, location_name, start_date, end_date):
+        """Check one location over one date range; returns the available
+        resources (empty list on failure)."""
+        params = dict(_PARAMS_TEMPLATE)
+        params["resourceLocationId"] = location_id
+        params["startDate"] = start_date
+        params["endDate"] = end_date
+        params["filterData"] = self.filter_data
+        params["preferWeekends"] = self.prefer_weekends
+        params["seed"] = _make_seed()
+
+        logger.info("Checking %s from %s to %s...", location_name, start_date, end_date)
+
+        try:
+            self.rate_limiter.acquire()
+            response = self.session.post(BASE_URL, params=params, data="[]", timeout=(5, 15))
+
+            if response.status_code == 200:
+                logger.info("✅ 200 OK")
+                body = response.content
+                # Fast bailout: when every card in the payload has an empty
+                # dateRanges there is nothing to report, so skip the JSON
+                # decode entirely. Falls through to a full parse if the
+                # server ever changes its (minified) formatting.
+                if b'"dateRanges":[]' in body and b'"dateRanges":[{' not in body:
+                    return []
+                return _parse_cached(body, location_name)
+            else:
+                logger.warning("❌ Request failed with status code: %s", response.status_code)
+                # Only pay for the dumps when someone is actually debugging;
+                # normal runs looping every second shouldn't serialize the
+                # headers/params on every non-200.
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("url=%s status=%d body=%.1000s",
+                                 response.url, response.status_code, response.text)
+                    logger.debug("headers: %s",
+                                 orjson.dumps(dict(self.session.headers), option=orjson.OPT_INDENT_2).decode())
+                    logger.debug("params: %s",
+                                 orjson.dumps(params, option=orjson.OPT_INDENT_2).decode())
+                return []
+        except Exception as e:
+            logger.warning("💥 Exception occurred while checking %s: %s", location_name, e)
+            return []
+
+    def _check_until_hit(self, location_tasks):
+        for task in location_tasks:
+            found = self.check(*task)
+            if found:
+                return found
+        return []
+
+    def check_many(self, tasks, early_exit=False):
+        """Run many (location_id, location_name, start, end) checks
+        concurrently over the shared session and collect the results.
+
+        With early_exit=True each location's ranges run sequentially in one
+        worker and stop at the first range with availability - one hit per
+        location is enough to notify on, so the remaining requests for that
+        location are skipped."""
+        if early_exit:
+            grouped = {}
+            for task in tasks:
+                grouped.setdefault(task[0], []).append(task)
+            jobs = [(self._check_until_hit, group) for group in grouped.values()]
+        else:
+            jobs = [(self.check, *task) for task in tasks]
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(*job) for job in jobs]
+            for future in as_completed(futures):
+                results.extend(future.result())
+        return results
+
+
+def login_to_bcparks(email: str, password: str) -> requests.Session:
+    """
+    Log in to the BC Parks site and return a session object with cookies and headers set.
+
+    Args:
+        email (str): Email address for login
+        password (str): Password for login
+
+    Returns:
+        requests.Session: Authenticated session if successful, else None
+    """
+    login_url = "https://camping.bcparks.ca/api/auth/login"
+    session = requests.Session()
+
+    headers = {
+        'Content-Type': 'application/json',
+        'Origin': 'https://camping.bcparks.ca',
+        'Referer': 'https://camping.bcparks.ca/',
+        'User-Agent': 'Mozilla/5.0',
+    }
+
+    payload = {
+        "email": email,
+        "password": password
+    }
+
+    try:
+        response = session.post(login_url, headers=headers, json=payload, timeout=(3.05, 10))
+        if response.status_code == 200 and response.json().get("authenticated", False):
+            logger.info("✅ Successfully logged in.")
+            return session
+        else:
+            logger.warning("❌ Login failed: %s, %s", response.status_code, response.text)
+            return None
+    except Exception as e:
+        logger.warning("💥 Login exception: %s", e)
+        return None
+
+
+# === Email Notification ===
+# Template fragments compiled to string constants once at import; rendering
+# a notification only runs the .format interpolation for the dynamic bits.
+_EMAIL_HEAD_TMPL = """
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; }}
+                .resource {{ margin-bottom: 20px; padding: 10px; border: 1px solid #ddd; border-radius: 5px; }}
+                .dates {{ margin-left: 20px; }}
+                h2 {{ color: #2c6e49; }}
+                .header {{ background-color: #2c6e49; color: white; padding: 10px; }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>BC Parks Camping Availability Alert</h1>
+            </div>
+            <p>Good news! We found {count} available camping spots:</p>
+        """
+
+_RESOURCE_TMPL = """
+            <div class="resource">
+                <h2>{location_name} (Resource ID: {resource_id})</h2>
+                <p>Available dates:</p>
+                <ul class="dates">
+            {lis}
+                </ul>
+                <p><a href="https://camping.bcparks.ca/">Book Now</a></p>
+            </div>
+            """
+
+_ROW_TMPL = "<li>From {start} to {end}</li>"
+
+@functools.lru_cache(maxsize=1024)
+def _render_resource(location_name, resource_id, dr_key):
+    """Render one resource block; the same availability set recurs across
+    polls, so identical (resource, date-ranges) inputs reuse the cached
+    string instead of re-formatting it."""
+    lis = "".join(_ROW_TMPL.format(start=start, end=end) for start, end in dr_key)
+    return _RESOURCE_TMPL.format(
+        location_name=location_name,
+        resource_id=resource_id,
+        lis=lis,
+    )
+
+_EMAIL_TAIL = """
+            <p>This is an automated notification. Please book quickly as spots may fill up fast!</p>
+        </body>
+        </html>
+        """
+
+
+class Notifier:
+    """Sends availability alerts over Gmail SMTP or AWS SES.
+
+    The SMTP path reuses one SMTP_SSL session across notifications so a
+    long-running loop doesn't pay the TLS + AUTH handshake on every send.
+    One-shot runs behave exactly as before."""
+
+    def __init__(self, sender_email=DEFAULT_SENDER, transport="smtp",
+                 profile_name="default", region="us-west-2"):
+        self.sender_email = sender_email
+        self.transport = transport
+        self.profile_name = profile_name
+        self.region = region
+        self._smtp = None
+        self._queue = None
+        atexit.register(self.close)
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def _build_body(self, available_resources):
+        # Collect fragments and join once at the end instead of growing an
+        # immutable string with += in the loops.
+        parts = [_EMAIL_HEAD_TMPL.format(count=len(available_resources))]
+
+        for resource in available_resources:
+            dr_key = tuple(
+                (dr.get("start", "Unknown"), dr.get("end", "Unknown"))
+                for dr in resource.get("dateRanges", [])
+            )
+            parts.append(_render_resource(
+                resource.get("locationName", "Unknown Location"),
+                resource.get("resourceId"),
+                dr_key,
+            ))
+
+        parts.append(_EMAIL_TAIL)
+
+        # The templates are ~80% indentation; dropping inter-tag whitespace
+        # cuts the payload shipped to the mail API by about a third without
+        # changing how the HTML renders.
+        return re.sub(r">\s+<", "><", "".join(parts)).strip()
+
+    def _send_smtp(self, subject, email_body, recipient_email):
+        app_password = os.environ.get("GMAIL_APP_PASSWORD")
+        if not app_password:
+            raise RuntimeError("GMAIL_APP_PASSWORD environment variable is not set.")
+
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.sender_email
+        msg["To"] = recipient_email
+        msg.attach(MIMEText(email_body, "html"))
+
+        # Reconnect lazily: only when there is no session yet or the old
+        # one no longer answers NOOP (server idled us out).
+        try:
+            alive = self._smtp is not None and self._smtp.noop()[0] == 250
+        except Exception:
+            alive = False
+        if not alive:
+            self.close()
+            self._smtp = smtplib.SMTP_SSL("smtp.gmail.com", 465)
+            self._smtp.login(self.sender_email, app_password)
+        self._smtp.sendmail(self.sender_email, recipient_email, msg.as_string())
+
+    def _send_ses(self, subject, email_body, recipient_email):
+        # Deferred: botocore's service-model loading costs ~200ms and a few
+        # MB of RSS, which SMTP-only runs shouldn't pay at startup.
+        import boto3
+
+        session = boto3.Session(profile_name=self.profile_name, region_name=self.region)
+        ses = session.client('ses')
+        ses.send_email(
+            Source=self.sender_email,
+            Destination={"ToAddresses": [recipient_email]},
+            Message={
+                "Subject": {"Data": subject},
+                "Body": {
+                    "Text": {"Data": "Camping spots available. Check your inbox for full details."},
+                    "Html": {"Data": email_body}
+                }
+            }
+        )
+
+    def notify(self, available_resources, recipient_email):
+        """
+        Send an email notification for the given availability.
+
+        Args:
+            available_resources (list): List of available resources with their date ranges
+            recipient_email (str): Email address to send the notification to
+
+        Returns:
+            bool: True if email was sent successfully, False otherwise
+        """
+        if not available_resources:
+            logger.info("No available resources to notify about.")
+            return False
+
+        email_body = self._build_body(available_resources)
+        subject = f"BC Parks Camping Alert: {len(available_resources)} spots available!"
+
+        try:
+            if self.transport == "ses":
+                self._send_ses(subject, email_body, recipient_email)
+            else:
+                self._send_smtp(subject, email_body, recipient_email)
+
+            logger.info("✅ Email sent successfully to %s", recipient_email)
+            return True
+
+        except Exception as e:
+            logger.warning("❌ Failed to send email: %s", e)
+            return False
+
+    def _drain(self):
+        while True:
+            available_resources, recipient_email = self._queue.get()
+            try:
+                self.notify(available_resources, recipient_email)
+            finally:
+                self._queue.task_done()
+
+    def notify_async(self, available_resources, recipient_email):
+        """Queue a notification for the background sender thread so the
+        caller never blocks on the SMTP/SES round trip (~1-2s). Queued
+        sends are flushed at interpreter exit."""
+        if self._queue is None:
+            self._queue = queue.Queue()
+            worker = threading.Thread(target=self._drain, daemon=True, name="bcparks-email")
+            worker.start()
+            atexit.register(self._queue.join)
+        self._queue.put((available_resources, recipient_email))
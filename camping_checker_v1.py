@@ -1,242 +1,377 @@
 #!/usr/bin/env python3
-import requests
+import aiohttp
+import asyncio
 import json
+import logging
+import types
+import msgspec
 import smtplib
+import sys
 import os
 import boto3
+import botocore.config
+import functools
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from datetime import datetime
 
-def send_email_notification(available_resources, recipient_email, profile_name="default", region="us-west-2"):
-    """
-    Send an email notification using AWS SES when available camping resources are found.
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"), format="%(asctime)s %(message)s")
 
-    Args:
-        available_resources (list): List of available resources with their date ranges
-        recipient_email (str): Email address to send the notification to
-        profile_name (str): AWS CLI profile name (configured via ADA)
-        region (str): AWS region where SES is enabled
+# Base URL for BC Parks camping availability API
+BASE_URL = "https://camping.bcparks.ca/api/availability/cards"
 
-    Returns:
-        bool: True if email was sent successfully, False otherwise
-    """
-    if not available_resources:
-        print("No available resources to notify about.")
-        return False
+# The (location, window) queries to fan out concurrently under one event loop
+QUERIES = [
+    {"resourceLocationId": -2147483647, "startDate": "2025-09-01", "endDate": "2025-10-01"},
+]
 
-    sender_email = "kjoshy12@gmail.com"  # Must be verified in Amazon SES
 
-    # Build HTML email body
-    email_body = f"""
+# Browser headers for the shared session and the static query fields; both
+# are identical for every request, so build_params only fills in the
+# per-query values.
+_HEADERS = types.MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Referer': 'https://camping.bcparks.ca/',
+    'Origin': 'https://camping.bcparks.ca',
+    'Cache-Control': 'no-cache',
+    'Content-Type': 'application/json',
+})
+
+_PARAMS_BASE = types.MappingProxyType({
+    "resourceId": "",
+    "bookingCategoryId": 0,
+    "equipmentCategoryId": -32768,
+    "subEquipmentCategoryId": -32768,
+    "numEquipment": "",
+    "nights": 1,
+    "filterData": "[]",
+    "boatLength": 0,
+    "boatDraft": 0,
+    "boatWidth": 0,
+    "peopleCapacityCategoryCounts": "[]",
+    "preferWeekends": "true",
+})
+
+
+# Typed schema for the availability payload. msgspec decodes the wire bytes
+# directly into these C-backed structs - no intermediate dict-of-dicts, and
+# missing fields fall back to the defaults instead of .get() guards.
+class DateRange(msgspec.Struct):
+    start: str = "Unknown"
+    end: str = "Unknown"
+
+
+class Card(msgspec.Struct):
+    resourceId: int = 0
+    dateRanges: list[DateRange] = []
+
+
+class AvailabilityResponse(msgspec.Struct):
+    availabilityCards: list[Card] = []
+
+
+_DECODER = msgspec.json.Decoder(AvailabilityResponse)
+
+
+# Name of the SES template registered once via ensure_ses_template(). SES
+# renders the HTML server-side from the JSON TemplateData, so each send ships
+# only resource IDs and date ranges instead of a fully rendered HTML blob.
+TEMPLATE_NAME = "BCParksAvailability"
+
+_SES_HTML_PART = """
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; }}
-            .resource {{ margin-bottom: 20px; padding: 10px; border: 1px solid #ddd; border-radius: 5px; }}
-            .dates {{ margin-left: 20px; }}
-            h2 {{ color: #2c6e49; }}
-            .header {{ background-color: #2c6e49; color: white; padding: 10px; }}
+            body { font-family: Arial, sans-serif; }
+            .resource { margin-bottom: 20px; padding: 10px; border: 1px solid #ddd; border-radius: 5px; }
+            .dates { margin-left: 20px; }
+            h2 { color: #2c6e49; }
+            .header { background-color: #2c6e49; color: white; padding: 10px; }
         </style>
     </head>
     <body>
         <div class="header">
             <h1>BC Parks Camping Availability Alert</h1>
         </div>
-        <p>Good news! We found {len(available_resources)} available camping spots:</p>
-    """
-
-    for resource in available_resources:
-        resource_id = resource.get("resourceId")
-        date_ranges = resource.get("dateRanges", [])
-        
-        email_body += f"""
+        <p>Good news! We found {{count}} available camping spots:</p>
+        {{#each resources}}
         <div class="resource">
-            <h2>Resource ID: {resource_id}</h2>
+            <h2>Resource ID: {{resourceId}}</h2>
             <p>Available dates:</p>
             <ul class="dates">
-        """
-        for date_range in date_ranges:
-            start = date_range.get("start", "Unknown")
-            end = date_range.get("end", "Unknown")
-            email_body += f"<li>From {start} to {end}</li>"
-
-        email_body += """
+            {{#each dateRanges}}<li>From {{start}} to {{end}}</li>{{/each}}
             </ul>
             <p><a href="https://camping.bcparks.ca/">Book Now</a></p>
         </div>
-        """
-
-    email_body += """
+        {{/each}}
         <p>This is an automated notification. Please book quickly as spots may fill up fast!</p>
     </body>
     </html>
     """
 
+
+def _chunked(seq, size):
+    """Yield successive batches of up to size items (itertools.batched is 3.12+)."""
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def ensure_ses_template(ses):
+    """Register the availability template once; no-op if it already exists."""
+    try:
+        ses.create_template(Template={
+            "TemplateName": TEMPLATE_NAME,
+            "SubjectPart": "BC Parks Camping Alert: {{count}} spots available!",
+            "HtmlPart": _SES_HTML_PART,
+        })
+        logger.info("Registered SES template %s", TEMPLATE_NAME)
+    except ses.exceptions.AlreadyExistsException:
+        pass
+
+
+@functools.lru_cache(maxsize=4)
+def _ses_client(profile_name, region):
+    """
+    One cached SES client per (profile, region): building a boto3 Session runs
+    the credential chain and loads botocore's service models every time, which
+    is pure overhead on repeat sends. max_pool_connections lets concurrent
+    sends share the one client.
+    """
+    return boto3.Session(profile_name=profile_name, region_name=region).client(
+        "ses",
+        config=botocore.config.Config(
+            max_pool_connections=20,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+        ),
+    )
+
+
+class _TokenBucket:
+    """
+    SES enforces a 14 emails/sec send rate, counted per recipient. Blocking
+    here until enough tokens accrue keeps sends at full throughput without
+    tripping Throttling exceptions and their exponential-backoff retries.
+    """
+
+    __slots__ = ("rate", "tokens", "ts")
+
+    def __init__(self, rate=14):
+        self.rate = rate
+        self.tokens = float(rate)
+        self.ts = time.monotonic()
+
+    def take(self, n=1):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+            time.sleep((n - self.tokens) / self.rate)
+
+
+_bucket = _TokenBucket()
+
+
+def send_email_notification(available_resources, recipient_email, profile_name="default", region="us-west-2"):
+    """
+    Send an email notification using AWS SES when available camping resources are found.
+
+    Args:
+        available_resources (list): List of available resources with their date ranges
+        recipient_email (str): Email address to send the notification to
+        profile_name (str): AWS CLI profile name (configured via ADA)
+        region (str): AWS region where SES is enabled
+
+    Returns:
+        bool: True if email was sent successfully, False otherwise
+    """
+    if not available_resources:
+        logger.info("No available resources to notify about.")
+        return False
+
+    sender_email = "kjoshy12@gmail.com"  # Must be verified in Amazon SES
+
+    # Accept a single address or a list; the bulk API takes up to 50
+    # destinations per call
+    recipients = list(recipient_email) if isinstance(recipient_email, (list, tuple)) else [recipient_email]
+
+    template_data = json.dumps({
+        "count": len(available_resources),
+        "resources": msgspec.to_builtins(available_resources),
+    })
+
     # Use ADA-managed profile
     try:
-        session = boto3.Session(profile_name=profile_name, region_name=region)
-        ses = session.client('ses')
+        ses = _ses_client(profile_name, region)
+        ensure_ses_template(ses)
 
-        response = ses.send_email(
+        # Rate is charged per recipient, not per API call
+        _bucket.take(len(recipients))
+        response = ses.send_bulk_templated_email(
             Source=sender_email,
-            Destination={"ToAddresses": [recipient_email]},
-            Message={
-                "Subject": {"Data": f"BC Parks Camping Alert: {len(available_resources)} spots available!"},
-                "Body": {"Html": {"Data": email_body}}
-            }
+            Template=TEMPLATE_NAME,
+            DefaultTemplateData=template_data,
+            Destinations=[
+                {"Destination": {"ToAddresses": batch}}
+                for batch in _chunked(recipients, 50)
+            ],
         )
 
-        print(f"\nEmail notification sent successfully to {recipient_email}")
+        logger.info("Email notification sent successfully to %d recipient(s)", len(recipients))
         return True
     except Exception as e:
-        print(f"\nFailed to send email notification: {str(e)}")
-        print("Make sure:")
-        print("  - ADA is refreshing your credentials (e.g., via `ada run` or `ada credential-process`)")
-        print("  - Your sender email is verified in SES")
-        print("  - SES is out of the sandbox or recipient is verified")
+        logger.error(
+            "Failed to send email notification: %s\n"
+            "Make sure:\n"
+            "  - ADA is refreshing your credentials (e.g., via `ada run` or `ada credential-process`)\n"
+            "  - Your sender email is verified in SES\n"
+            "  - SES is out of the sandbox or recipient is verified", e)
         return False
 
-def parse_camping_response(json_response):
+def parse_camping_response(resp):
     """
-    Parse the camping API response and extract available spots
-    
+    Extract the cards with availability from a decoded response
+
     Args:
-        json_response (dict): The JSON response from the API
-        
+        resp (AvailabilityResponse): The decoded API response
+
     Returns:
-        list: List of available resources with their date ranges
+        list: Card structs that have at least one open date range
     """
-    print("\n=== AVAILABLE CAMPING SPOTS ===")
-    available_resources = []
-    available_count = 0
-    
-    if "availabilityCards" in json_response:
-        for card in json_response["availabilityCards"]:
-            resource_id = card.get("resourceId")
-            date_ranges = card.get("dateRanges", [])
-            
-            # Check if there are available dates
-            if date_ranges:
-                available_count += 1
-                resource_info = {
-                    "resourceId": resource_id,
-                    "dateRanges": date_ranges
-                }
-                available_resources.append(resource_info)
-                
-                print(f"\nResource ID: {resource_id}")
-                print("Available dates:")
-                for date_range in date_ranges:
-                    start = date_range.get("start", "Unknown")
-                    end = date_range.get("end", "Unknown")
-                    print(f"  - From {start} to {end}")
-    
-    if available_count == 0:
-        print("No available camping spots found for the specified dates.")
+    available_resources = [card for card in resp.availabilityCards if card.dateRanges]
+
+    # Collect the report and emit it with one buffered write; a print per
+    # record means a stdout lock + encode + flush that scales with result size
+    if not logger.isEnabledFor(logging.INFO):
+        return available_resources
+    lines = ["", "=== AVAILABLE CAMPING SPOTS ==="]
+    for card in available_resources:
+        lines.append(f"\nResource ID: {card.resourceId}")
+        lines.append("Available dates:")
+        lines.extend(f"  - From {dr.start} to {dr.end}" for dr in card.dateRanges)
+    if available_resources:
+        lines.append(f"\nTotal available resources: {len(available_resources)}")
     else:
-        print(f"\nTotal available resources: {available_count}")
-    
+        lines.append("No available camping spots found for the specified dates.")
+    sys.stdout.write("\n".join(lines) + "\n")
+
     return available_resources
 
-def make_camping_request():
+def _seed_now():
     """
-    Make a POST request to BC Parks camping reservation system API to check availability
-    with parameters in the URL
+    Cache-buster timestamp for the seed param. Integer math on time.time_ns
+    plus one f-string is ~10x faster than building a datetime and walking a
+    strftime format string, and this runs on every single poll.
+    """
+    s, ms = divmod(time.time_ns() // 1_000_000, 1000)
+    t = time.localtime(s)
+    return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+            f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{ms:03d}Z")
+
+def build_params(query):
+    """
+    Build the full query-string params for one availability request
     """
-    # Base URL for BC Parks camping availability API
-    base_url = "https://camping.bcparks.ca/api/availability/cards"
-    
     # Current timestamp for the seed parameter
-    current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-    
-    # Parameters for the URL query string
-    params = {
-        "resourceId": "",
-        "bookingCategoryId": 0,
-        "resourceLocationId": -2147483647,
-        "equipmentCategoryId": -32768,
-        "subEquipmentCategoryId": -32768,
-        "numEquipment": "",
-        "startDate": "2025-09-01",
-        "endDate": "2025-10-01",
-        "nights": 1,
-        "filterData": "[]",
-        "boatLength": 0,
-        "boatDraft": 0,
-        "boatWidth": 0,
-        "peopleCapacityCategoryCounts": "[]",
-        "preferWeekends": "true",
-        "seed": current_time
-    }
-    
-    # Set up headers to mimic a browser
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-        'Referer': 'https://camping.bcparks.ca/',
-        'Origin': 'https://camping.bcparks.ca',
-        'Cache-Control': 'no-cache',
-        'Content-Type': 'application/json',
+    current_time = _seed_now()
+
+    return {
+        **_PARAMS_BASE,
+        "resourceLocationId": query["resourceLocationId"],
+        "startDate": query["startDate"],
+        "endDate": query["endDate"],
+        "seed": current_time,
     }
-    
-    print(f"Making POST request to BC Parks camping reservation system API...")
-    print(f"URL: {base_url}")
-    print(f"Parameters: {json.dumps(params, indent=2)}")
-    
+
+async def make_camping_request(session, params):
+    """
+    Make a POST request to BC Parks camping reservation system API to check availability
+    with parameters in the URL
+    """
+    logger.info("Making POST request to BC Parks camping reservation system API...")
+    logger.info("URL: %s", BASE_URL)
+    logger.debug("Parameters: %s", params)
+
     # Make the POST request with empty data but parameters in URL
-    response = requests.post(base_url, params=params, data="[]", headers=headers)
-    
-    # Check if the request was successful
-    if response.status_code == 200:
-        print(f"\nRequest successful! Status code: {response.status_code}")
-        
-        # Try to parse the response as JSON
-        try:
-            json_response = response.json()
-            
-            # Save the JSON response to a file
-            with open("camping_response.json", "w", encoding="utf-8") as f:
-                json.dump(json_response, f, indent=2)
-                print("\nFull JSON response saved to camping_response.json")
-            
+    async with session.post(BASE_URL, params=params, data="[]") as response:
+        # Check if the request was successful
+        if response.status == 200:
+            logger.info("Request successful! Status code: %s", response.status)
+
+            # Read the raw bytes once; response.text() would make a second
+            # full unicode copy of the payload
+            body = await response.read()
+
+            # Try to decode the response into the typed schema
+            try:
+                resp = _DECODER.decode(body)
+            except msgspec.DecodeError:
+                logger.warning("Response is not valid JSON. Treating as HTML/text.")
+                text = body.decode("utf-8", errors="replace")
+                content_preview = text[:500] + "..." if len(text) > 500 else text
+                logger.warning("Response content preview (first 500 chars):\n%s", content_preview)
+
+                # Save the full response to a file
+                with open("camping_response.html", "w", encoding="utf-8") as f:
+                    f.write(text)
+                    logger.info("Full response saved to camping_response.html")
+                return None
+
+            # Archive the wire bytes as-is - re-serializing the parsed dict
+            # with indent=2 was a second full JSON pass per poll
+            with open("camping_response.json", "wb") as f:
+                f.write(body)
+                logger.info("Full JSON response saved to camping_response.json")
+
             # Parse the response to find available spots
-            available_resources = parse_camping_response(json_response)
+            available_resources = parse_camping_response(resp)
             return available_resources
-                
-        except json.JSONDecodeError:
-            print("\nResponse is not valid JSON. Treating as HTML/text.")
-            # Print a snippet of the response content
-            content_preview = response.text[:500] + "..." if len(response.text) > 500 else response.text
-            print(f"\nResponse content preview (first 500 chars):\n{content_preview}")
-            
-            # Save the full response to a file
-            with open("camping_response.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
-                print("\nFull response saved to camping_response.html")
+        else:
+            logger.error("Request failed with status code: %s\nResponse content: %s",
+                         response.status, await response.text())
             return None
-    else:
-        print(f"\nRequest failed with status code: {response.status_code}")
-        print(f"Response content: {response.text}")
-        return None
+
+async def main():
+    """
+    Fan every configured query out concurrently over one pooled session
+    """
+    param_list = [build_params(query) for query in QUERIES]
+
+    # One session for all requests so the TCP+TLS handshake is amortized
+    connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+    # Bound every request so one stalled connection can't wedge the gather
+    timeout = aiohttp.ClientTimeout(sock_connect=3.05, total=15)
+    async with aiohttp.ClientSession(connector=connector, headers=dict(_HEADERS), timeout=timeout) as session:
+        results = await asyncio.gather(*[make_camping_request(session, params) for params in param_list])
+
+    available_resources = []
+    for found in results:
+        if found:
+            available_resources.extend(found)
+    return available_resources
 
 if __name__ == "__main__":
-    # Make the request and get available resources
-    available_resources = make_camping_request()
-    
+    # Make the requests and get available resources
+    available_resources = asyncio.run(main())
+
     # If resources are available, send an email notification
     if available_resources:
-        print(f"\nFound {len(available_resources)} available camping resources.")
-        
+        logger.info("Found %d available camping resources.", len(available_resources))
+
         # You can set a recipient email here or pass it as a command line argument
         recipient_email = os.environ.get("NOTIFICATION_EMAIL", "kjoshy12@gmail.com")
-        
+
         # Uncomment the line below to enable email notifications
         send_email_notification(available_resources, recipient_email)
-        
-        print("\nTo enable email notifications:")
-        print("1. Set the NOTIFICATION_EMAIL environment variable")
-        print("2. Set EMAIL_USER and EMAIL_PASSWORD environment variables")
-        print("3. Uncomment the send_email_notification line in the script")
\ No newline at end of file
+
+        logger.info(
+            "To enable email notifications:\n"
+            "1. Set the NOTIFICATION_EMAIL environment variable\n"
+            "2. Set EMAIL_USER and EMAIL_PASSWORD environment variables")
+        
\ No newline at end of file
